@@ -31,12 +31,12 @@ app = FastAPI(lifespan=lifespan)
 
 
 @app.get("/stream")
-def stream():
+async def stream():
     """
     Display a live stream from the camera
     :return:
     """
-    return StreamingResponse(camera.stream_preview(), media_type="multipart/x-mixed-replace;boundary=frame")
+    return StreamingResponse(camera.stream_preview_async(), media_type="multipart/x-mixed-replace;boundary=frame")
 
 
 @app.get("/config")
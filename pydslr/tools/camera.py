@@ -3,28 +3,72 @@ Main Camera class
 """
 
 # pylint: disable=no-member
+import asyncio
 import datetime
 import io
 import logging
+import queue
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from contextlib import contextmanager
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Generator, Generic, List, Optional, Set, TypeVar, get_args
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, Generic, List, Optional, Set, Tuple, TypeVar, get_args
 
 import gphoto2 as gp  # type: ignore
 import numpy as np
-import psutil
 from PIL import Image
-from tqdm import trange
+from pydantic import BaseModel
+
+try:
+    import simplejpeg  # type: ignore
+except ModuleNotFoundError:
+    # module logger, as the root logging.warning() would configure logging before basicConfig below
+    logging.getLogger(__name__).warning("simplejpeg not found, decoding previews with PIL.")
+    simplejpeg = None
 
 from pydslr.config.base import BaseConfig
 from pydslr.config.r6m2 import CaptureSettings, ImageSettings, R6M2Config, Settings
-from pydslr.tools.exif import get_exif
+from pydslr.tools.exif import get_exif_batch
 from pydslr.utils import GPWidgetItem, PyDSLRException, timed
 
 logging.basicConfig(format="%(asctime)s - %(levelname)s - %(message)s", level=logging.DEBUG)
 
 T = TypeVar("T", bound=BaseConfig)
+M = TypeVar("M", bound=BaseModel)
+
+_MJPEG_HEADER = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+_MJPEG_TRAILER = b"\r\n"
+
+
+@lru_cache(maxsize=None)
+def _nested_model_classes(cls: type[BaseModel]) -> Dict[str, type[BaseModel]]:
+    """
+    Map each field of a model holding a nested model to that model class, unwrapping Optional[...].
+    :param cls:
+    :return:
+    """
+    classes = {}
+    for name, field in cls.model_fields.items():
+        for arg in get_args(field.annotation) or (field.annotation,):
+            if isinstance(arg, type) and issubclass(arg, BaseModel):
+                classes[name] = arg
+    return classes
+
+
+def _construct(cls: type[M], kwargs: Dict[str, Any]) -> M:
+    """
+    Build a model and its nested models from trusted nested kwargs via model_construct, at any nesting depth.
+    :param cls:
+    :param kwargs:
+    :return:
+    """
+    classes = _nested_model_classes(cls)
+    return cls.model_construct(
+        **{name: _construct(classes[name], value) if name in classes and isinstance(value, dict) else value for name, value in kwargs.items()}
+    )
 
 
 class Camera(Generic[T]):
@@ -37,46 +81,143 @@ class Camera(Generic[T]):
         # pylint: disable=not-callable
         self.camera = gp.Camera()
         self._config = None
+        # flat views of the cached widget tree, keyed by the full section path of each setting
+        self._leaf_widgets: Dict[Tuple[str, ...], Any] = {}
+        self._leaf_values: Dict[Tuple[str, ...], Any] = {}
+        self._parsed_config: Optional[T] = None
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+        # serializes camera access from async callers, libgphoto2 handles are not thread-safe
+        self._camera_pool = ThreadPoolExecutor(max_workers=1)
 
     def __enter__(self):
         self.camera.init()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self._io_pool.shutdown(wait=True)
+        self._camera_pool.shutdown(wait=True)
         gp.gp_camera_exit(self.camera)
 
+    @staticmethod
+    def _save_file(c_file, c_path: Path) -> Path:
+        """
+        Write a downloaded camera file to disk. Runs on the I/O pool, off the camera thread.
+        :param c_file: gphoto2 CameraFile holding the downloaded data
+        :param c_path: Target path
+        :return:
+        """
+        data = memoryview(gp.gp_file_get_data_and_size(c_file)[1])
+        if len(data) == 0:
+            raise PyDSLRException(f"Got zero-byte image {c_path.name}. Make sure auto focus is possible.")
+        c_path.write_bytes(data)
+        return c_path
+
+    @staticmethod
+    def _log_exif(paths: List[Path]):
+        """
+        Log the key EXIF infos of freshly taken pictures, querying exiftool once for all of them.
+        :param paths:
+        :return:
+        """
+        for c_path, exif_data in zip(paths, get_exif_batch(paths)):
+            logging.info("Got picture with EXIF: %s in %s", exif_data, c_path)
+
     @staticmethod
     def _maybe_kill_ptp():
         """
         Make sure device not claimed by ptpcamerad on macOS, otherwise we get errors running as non-root
         :return:
         """
-        for proc in psutil.process_iter():
-            name = proc.name()
-            if "ptpcamerad" in name:
+        if sys.platform != "darwin":
+            return
+
+        import psutil  # pylint: disable=import-outside-toplevel
+
+        for proc in psutil.process_iter(attrs=["name"]):
+            if "ptpcamerad" in (proc.info["name"] or ""):
                 logging.info("Found ptpcamerad as PID %s, killing...", proc.pid)
-                proc.kill()
+                try:
+                    proc.kill()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    logging.warning("Could not kill ptpcamerad as PID %s", proc.pid)
+                return
 
     @timed
-    def preview_as_bytes(self) -> bytes:
+    def preview_as_bytes(self) -> memoryview:
         """
-        Load the current preview/LiveView image as byte array in JPEG format. If settings were recently updated,
-        this may not yet fully reflect it, as the camera usually keeps the preview buffered.
+        Load the current preview/LiveView image as bytes-like view in JPEG format, without copying the gphoto2 buffer.
+        If settings were recently updated, this may not yet fully reflect it, as the camera usually keeps the preview buffered.
         :return:
         """
         _, file = gp.gp_camera_capture_preview(self.camera)
-        data = bytearray(gp.gp_file_get_data_and_size(file)[1])
-        return data
+        return memoryview(gp.gp_file_get_data_and_size(file)[1])
+
+    def preview_as_numpy(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Load the current preview/LiveView image as RGB numpy array, decoded by libjpeg-turbo via simplejpeg if available,
+        otherwise via Image.open()
+        :param out: Optional preallocated array of matching shape and dtype the image is written into.
+        :return:
+        """
+        return self._decode_preview(self.preview_as_bytes(), out=out)
 
-    def preview_as_numpy(self) -> np.ndarray:
+    def preview_as_both(self) -> Tuple[memoryview, np.ndarray]:
         """
-        Load the current preview/LiveView image as numpy array via Image.open()
+        Load the current preview/LiveView image once, both as JPEG data and decoded numpy array,
+        for consumers that serve the JPEG and analyze the pixels of the same frame.
         :return:
         """
-        with io.BytesIO() as buffer:
-            buffer.write(self.preview_as_bytes())
-            buffer.seek(0)
-            return np.asarray(Image.open(buffer))
+        data = self.preview_as_bytes()
+        return data, self._decode_preview(data)
+
+    @staticmethod
+    def _decode_preview(data: memoryview, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Decode preview JPEG data to an RGB numpy array, see :meth:`preview_as_numpy`
+        :param data: JPEG data
+        :param out: Optional preallocated array of matching shape and dtype the image is written into.
+        :return:
+        """
+        if simplejpeg is not None:
+            return simplejpeg.decode_jpeg(data, colorspace="RGB", buffer=out)
+
+        with io.BytesIO(data) as buffer:
+            img = Image.open(buffer)
+            img.load()
+            # a single tobytes() fill is considerably faster than np.asarray's chunked __array_interface__ export
+            image = np.frombuffer(img.tobytes(), dtype=np.uint8).reshape(img.height, img.width, len(img.getbands()))
+        if out is None:
+            return image
+        np.copyto(out, image)
+        return out
+
+    def preview_as_tensor(self, device: str = "cuda"):
+        """
+        Load the current preview/LiveView image as CHW uint8 torch tensor, decoded on the given device
+        (nvJPEG for cuda). Requires torch and torchvision to be installed.
+        :param device: Torch device to decode on.
+        :return:
+        """
+        return self.batch_preview_as_tensor(1, device=device)[0]
+
+    def batch_preview_as_tensor(self, n_images: int, device: str = "cuda") -> list:
+        """
+        Grab several consecutive preview images and decode them in one batched torchvision call.
+        Requires torch and torchvision to be installed.
+        :param n_images: Number of preview images to grab.
+        :param device: Torch device to decode on.
+        :return: List of CHW uint8 tensors.
+        """
+        try:
+            # pylint: disable=import-outside-toplevel
+            import torch  # type: ignore
+            from torchvision.io import decode_jpeg  # type: ignore
+        except ModuleNotFoundError as e:
+            raise PyDSLRException("Decoding previews to tensors requires torch and torchvision.") from e
+
+        # torch.frombuffer needs a writable buffer, the copy is small compared to the decode
+        data = [torch.frombuffer(bytearray(self.preview_as_bytes()), dtype=torch.uint8) for _ in range(n_images)]
+        return decode_jpeg(data, device=device)
 
     @timed
     def preview_to_file(self, path: Optional[Path] = None):
@@ -99,36 +240,138 @@ class Camera(Generic[T]):
         max_time: Optional[datetime.timedelta] = None,
         max_images: Optional[int] = None,
         as_numpy=False,
+        drop_frames=False,
     ) -> Generator[bytes | np.ndarray, None, None]:
         """
         Yield images as part of a media stream
         :param max_images: Max number of images to return.
-        :param as_numpy: Return data as a numpy array
+        :param as_numpy: Return data as a numpy array. The same buffer is reused for every frame, copy it if you need to keep it.
         :param max_fps: Maximum FPS
         :param max_time: Maximum time to stream images
+        :param drop_frames: Grab previews on a background thread and only ever yield the newest one,
+            so a slow consumer sees current frames instead of a growing lag. The camera must not be used otherwise while streaming.
         :return:
         """
-        last = None
-        first = datetime.datetime.utcnow()
-        delay = None if max_fps is None else datetime.timedelta(milliseconds=1000 / max_fps)
+        stop = threading.Event()
+        producer: Optional[threading.Thread] = None
+        next_preview: Callable[[], memoryview] = self.preview_as_bytes
+        if drop_frames:
+            producer, next_preview = self._start_preview_producer(stop)
+
+        last_ns = None
+        first_ns = time.monotonic_ns()
+        delay_ns = None if max_fps is None else 10**9 // max_fps
+        max_time_ns = None if max_time is None else int(max_time.total_seconds() * 1e9)
         count = 0
+        buffer: Optional[np.ndarray] = None
+        try:
+            while True:
+                if last_ns is not None and delay_ns is not None:
+                    remaining_ns = last_ns + delay_ns - time.monotonic_ns()
+                    if remaining_ns > 0:
+                        time.sleep(remaining_ns / 1e9)
+                last_ns = time.monotonic_ns()
+                if max_time_ns is not None and (last_ns - first_ns) > max_time_ns:
+                    return
+
+                if max_images is not None and count >= max_images:
+                    return
+
+                count += 1
+                if not as_numpy:
+                    yield b"".join((_MJPEG_HEADER, next_preview(), _MJPEG_TRAILER))
+                elif buffer is None:
+                    buffer = self._decode_preview(next_preview())
+                    if not buffer.flags.writeable:
+                        buffer = buffer.copy()
+                    yield buffer
+                else:
+                    yield self._decode_preview(next_preview(), out=buffer)
+        finally:
+            stop.set()
+            if producer is not None:
+                # the producer may still be inside a preview call, wait so the camera is free again for the caller
+                producer.join()
+
+    async def stream_preview_async(
+        self,
+        max_fps: Optional[int] = None,
+        max_time: Optional[datetime.timedelta] = None,
+        max_images: Optional[int] = None,
+        as_numpy=False,
+    ) -> AsyncGenerator[bytes | np.ndarray, None]:
+        """
+        Async version of :meth:`stream_preview`, not blocking the event loop while waiting for the camera.
+        Camera calls of all async streams are serialized on one worker thread.
+        :param max_images: Max number of images to return.
+        :param as_numpy: Return data as a numpy array. The same buffer is reused for every frame, copy it if you need to keep it.
+        :param max_fps: Maximum FPS
+        :param max_time: Maximum time to stream images
+        :return:
+        """
+        loop = asyncio.get_running_loop()
+        last_ns = None
+        first_ns = time.monotonic_ns()
+        delay_ns = None if max_fps is None else 10**9 // max_fps
+        max_time_ns = None if max_time is None else int(max_time.total_seconds() * 1e9)
+        count = 0
+        buffer: Optional[np.ndarray] = None
         while True:
-            if last is not None and delay is not None:
-                remaining_delay = last + delay - datetime.datetime.utcnow()
-                if remaining_delay.total_seconds() > 0:
-                    time.sleep(remaining_delay.total_seconds())
-            last = datetime.datetime.utcnow()
-            if max_time is not None and (last - first) > max_time:
+            if last_ns is not None and delay_ns is not None:
+                remaining_ns = last_ns + delay_ns - time.monotonic_ns()
+                if remaining_ns > 0:
+                    await asyncio.sleep(remaining_ns / 1e9)
+            last_ns = time.monotonic_ns()
+            if max_time_ns is not None and (last_ns - first_ns) > max_time_ns:
                 return
 
             if max_images is not None and count >= max_images:
                 return
 
             count += 1
+            frame = await loop.run_in_executor(self._camera_pool, self.preview_as_bytes)
             if not as_numpy:
-                yield b"--frame\r\n" b"Content-Type: image/jpeg\r\n\r\n" + self.preview_as_bytes() + b"\r\n"
+                yield b"".join((_MJPEG_HEADER, frame, _MJPEG_TRAILER))
+            elif buffer is None:
+                buffer = await loop.run_in_executor(None, self._decode_preview, frame)
+                if not buffer.flags.writeable:
+                    buffer = buffer.copy()
+                yield buffer
             else:
-                yield self.preview_as_numpy()
+                yield await loop.run_in_executor(None, self._decode_preview, frame, buffer)
+
+    def _start_preview_producer(self, stop: threading.Event) -> Tuple[threading.Thread, Callable[[], memoryview]]:
+        """
+        Start a daemon thread continuously grabbing previews into a single-slot queue, replacing unconsumed frames.
+        :param stop: Event to end the thread.
+        :return: The started thread and a function blocking until the newest frame is available and returning it.
+        """
+        frames: queue.Queue = queue.Queue(maxsize=1)
+
+        def _produce():
+            while not stop.is_set():
+                try:
+                    frame = self.preview_as_bytes()
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    frame = e
+                    stop.set()
+                try:
+                    frames.get_nowait()
+                except queue.Empty:
+                    pass
+                # only this thread puts, so the slot is free here
+                frames.put_nowait(frame)
+
+        producer = threading.Thread(target=_produce, name="pydslr-preview", daemon=True)
+        producer.start()
+
+        def _next_frame() -> memoryview:
+            frame = frames.get()
+            if isinstance(frame, Exception):
+                raise frame
+            return frame
+
+        return producer, _next_frame
 
     @timed
     def bulb_capture(self, shutter_press_time: datetime.timedelta, path: Optional[Path] = None, keep_on_camera: bool = False) -> Path:
@@ -140,33 +383,13 @@ class Camera(Generic[T]):
         :param keep_on_camera: If capture is to SD Card, keeps the images after downloading.
         :return:
         """
-        self.set_config(self.get_config().press_shutter())
-        time.sleep(shutter_press_time.total_seconds())
-        self.set_config(self.get_config().release_shutter())
-
-        _image = None
-        start_wait_at = datetime.datetime.now()
-        while (datetime.datetime.now() - start_wait_at).total_seconds() < 20:
-            evt = gp.gp_camera_wait_for_event(self.camera, 100)
-            if evt[1] == gp.GP_EVENT_FILE_ADDED:
-                _image = evt[2]
-            elif evt[1] == gp.GP_EVENT_CAPTURE_COMPLETE:
-                break
-
-        if _image is None:
+        images = self._press_and_release(shutter_press_time)
+        if not images:
             raise PyDSLRException("No capture event detected")
 
-        _, c_file = gp.gp_camera_file_get(self.camera, _image.folder, _image.name, gp.GP_FILE_TYPE_NORMAL)
+        _image = images[-1]
         c_path = Path(_image.name) if path is None else path
-        c_file.save(str(c_path))
-
-        exif_data = get_exif(c_path)
-        logging.info("Got picture with EXIF: %s in %s", exif_data, c_path)
-
-        if not keep_on_camera or not self.get_config().is_sdcard_capture_enabled():
-            gp.gp_camera_file_delete(self.camera, _image.folder, _image.name)
-
-        return c_path
+        return self._download_images([_image], [c_path], keep_on_camera=keep_on_camera)[0]
 
     @timed
     def highspeed_capture(self, shutter_press_time: datetime.timedelta, folder: Optional[Path] = None, keep_on_camera: bool = False) -> List[Path]:
@@ -185,46 +408,120 @@ class Camera(Generic[T]):
         if not folder.exists():
             raise ValueError(f"Folder {folder} does not exist")
 
-        self.set_config(self.get_config().press_shutter())
-        start_at = datetime.datetime.now()
+        _backlog = self._press_and_release(shutter_press_time)
+        return self._download_images(_backlog, [folder / file.name for file in _backlog], keep_on_camera=keep_on_camera)
 
-        _backlog = []
+    def _press_and_release(self, shutter_press_time: datetime.timedelta) -> list:
+        """
+        Keep the shutter pressed for the given time, then release it and wait for the capture to complete.
+        :param shutter_press_time: Time for the shutter to stay pressed
+        :return: gphoto2 CameraFilePath entries of all files added meanwhile
+        """
+        camera = self.camera
+        wait_for_event = gp.gp_camera_wait_for_event
+        file_added = gp.GP_EVENT_FILE_ADDED
+        added = []
 
+        self.set_config(self.get_config().press_shutter())
+        deadline = time.monotonic() + shutter_press_time.total_seconds()
         while True:
-            elapsed = datetime.datetime.now() - start_at
-            remaining = (shutter_press_time - elapsed).total_seconds()
-            if remaining > 0:
-                evt = tuple(gp.gp_camera_wait_for_event(self.camera, int(1000 * remaining)))
-                if evt[1] == gp.GP_EVENT_FILE_ADDED:
-                    _backlog.append(evt[2])
-            else:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 break
-
+            evt = wait_for_event(camera, int(1000 * remaining))
+            if evt[1] == file_added:
+                added.append(evt[2])
         self.set_config(self.get_config().release_shutter())
 
-        start_wait_at = datetime.datetime.now()
-        while (datetime.datetime.now() - start_wait_at).total_seconds() < 20:
-            evt = gp.gp_camera_wait_for_event(self.camera, 100)
-            if evt[1] == gp.GP_EVENT_FILE_ADDED:
-                _backlog.append(evt[2])
-            elif evt[1] == gp.GP_EVENT_CAPTURE_COMPLETE:
-                break
-
-        paths = []
-        for file in _backlog:
-            _, c_file = gp.gp_camera_file_get(self.camera, file.folder, file.name, gp.GP_FILE_TYPE_NORMAL)
-            c_path = folder / file.name
-            paths.append(c_path)
-            c_file.save(str(c_path))
+        added.extend(self._collect_images_added())
+        return added
 
-            exif_data = get_exif(c_path)
-            logging.info("Got picture with EXIF: %s in %s", exif_data, c_path)
+    def _collect_images_added(self, timeout: datetime.timedelta = datetime.timedelta(seconds=20)) -> list:
+        """
+        Drain camera events until the capture is reported complete or the timeout passes.
+        :param timeout: Maximum time to wait for GP_EVENT_CAPTURE_COMPLETE
+        :return: gphoto2 CameraFilePath entries of all files added meanwhile
+        """
+        camera = self.camera
+        wait_for_event = gp.gp_camera_wait_for_event
+        file_added = gp.GP_EVENT_FILE_ADDED
+        capture_complete = gp.GP_EVENT_CAPTURE_COMPLETE
+        added = []
+
+        deadline = time.monotonic() + timeout.total_seconds()
+        while time.monotonic() < deadline:
+            evt = wait_for_event(camera, 100)
+            if evt[1] == file_added:
+                added.append(evt[2])
+            elif evt[1] == capture_complete:
+                break
+        return added
 
-            if not keep_on_camera or not self.get_config().is_sdcard_capture_enabled():
-                gp.gp_camera_file_delete(self.camera, file.folder, file.name)
+    def _download_images(self, files: list, paths: List[Path], keep_on_camera: bool = False, log_exif: bool = True) -> List[Path]:
+        """
+        Download camera files to the given paths, removing them from the camera once written to disk.
+        USB transfers stay on this thread, as libgphoto2 is not safe to share a camera handle across threads,
+        while disk writes run on the I/O pool, overlapping with the next transfer.
+        At most two downloaded files are held in memory waiting for the disk.
 
+        :param files: gphoto2 CameraFilePath entries as reported by GP_EVENT_FILE_ADDED
+        :param paths: Target path for each file.
+        :param keep_on_camera: If capture is to SD Card, keeps the images after downloading.
+        :param log_exif: Log EXIF infos of all files with one exiftool call once downloaded, overlapping with the camera delete.
+        :return: All paths downloaded. If any file fails (e.g. zero bytes), the others are still downloaded before raising.
+        """
+        saved = []
+        for file, c_path in zip(files, paths):
+            if len(saved) >= 2:
+                # bound memory without raising here, failures are collected once all files are fetched
+                wait([saved[-2]])
+            _, c_file = gp.gp_camera_file_get(self.camera, file.folder, file.name, gp.GP_FILE_TYPE_NORMAL)
+            saved.append(self._io_pool.submit(self._save_file, c_file, c_path))
+
+        # only delete from the camera what is safely on disk
+        written, errors = [], []
+        for file, future in zip(files, saved):
+            try:
+                written.append((file, future.result()))
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                errors.append(e)
+
+        paths = [c_path for _, c_path in written]
+        # exiftool only reads the local files, so it runs on the I/O pool while the camera deletes over USB
+        exif_logged = self._io_pool.submit(self._log_exif, paths) if log_exif and paths else None
+
+        if written and (not keep_on_camera or not self.get_config().is_sdcard_capture_enabled()):
+            self._delete_files([file for file, _ in written])
+
+        if exif_logged is not None:
+            exif_logged.result()
+
+        if len(errors) == 1:
+            raise errors[0]
+        if errors:
+            raise PyDSLRException(f"{len(errors)} of {len(files)} downloads failed: {'; '.join(str(e) for e in errors)}") from errors[0]
         return paths
 
+    def _delete_files(self, files: list):
+        """
+        Delete files from the camera, using one delete_all per folder where the whole folder content was downloaded.
+        :param files: gphoto2 CameraFilePath entries
+        :return:
+        """
+        by_folder: Dict[str, Set[str]] = {}
+        for file in files:
+            by_folder.setdefault(file.folder, set()).add(file.name)
+
+        for c_folder, names in by_folder.items():
+            # listing is an extra round-trip, only worth it when one delete_all can replace several deletes
+            if len(names) > 1:
+                _, on_camera = gp.gp_camera_folder_list_files(self.camera, c_folder)
+                if {name for name, _ in on_camera} == names:
+                    gp.check_result(gp.gp_camera_folder_delete_all(self.camera, c_folder))
+                    continue
+            for name in names:
+                gp.gp_camera_file_delete(self.camera, c_folder, name)
+
     @timed
     def capture(self, path: Optional[Path] = None, folder: Optional[Path] = None, keep_on_camera: bool = False) -> Path:
         """
@@ -234,6 +531,14 @@ class Camera(Generic[T]):
         :param path: target path, set to current working directory / camera image name per default.
         :return: The final path.
         """
+        return self._capture(path=path, folder=folder, keep_on_camera=keep_on_camera)
+
+    def _capture(self, path: Optional[Path] = None, folder: Optional[Path] = None, keep_on_camera: bool = False, log_exif: bool = True) -> Path:
+        """
+        See :meth:`capture`
+        :param log_exif: Log EXIF infos, disabled when callers batch them.
+        :return:
+        """
         if path is not None:
             if self.get_config().is_raw():
                 assert ".cr3" in path.suffixes, "RAW format enabled, file format should be cr3"
@@ -246,19 +551,7 @@ class Camera(Generic[T]):
                 path = Path(file.name)
             else:
                 path = folder / file.name
-        _, c_file = gp.gp_camera_file_get(self.camera, file.folder, file.name, gp.GP_FILE_TYPE_NORMAL)
-        c_file.save(str(path))
-
-        if not keep_on_camera or not self.get_config().is_sdcard_capture_enabled():
-            gp.gp_camera_file_delete(self.camera, file.folder, file.name)
-
-        if path.stat().st_size == 0:
-            path.unlink()
-            raise PyDSLRException("Got zero-byte image during capture(). Make sure auto focus is possible.")
-
-        exif_data = get_exif(path)
-        logging.info("Got picture with EXIF: %s in %s", exif_data, path)
-        return path
+        return self._download_images([file], [path], keep_on_camera=keep_on_camera, log_exif=log_exif)[0]
 
     def focus_stack(self, n_images: int = 10, distance: int = 1, folder: Optional[Path] = None, keep_on_camera: bool = False) -> List[Path]:
         """
@@ -269,26 +562,45 @@ class Camera(Generic[T]):
         :param keep_on_camera: If capture is to SD Card, keeps the images after downloading.
         :return: All paths captured.
         """
+        from tqdm import trange  # pylint: disable=import-outside-toplevel
+
+        # build the step on an empty config, so it only carries the focus action and nothing from the (possibly stale) cache
+        step = self._config_cls().focus_step(distance=distance)
+
         results = []
         for _ in trange(n_images, desc="Performing focus stack"):
-            results.append(self.capture(path=folder, keep_on_camera=keep_on_camera))
-            self.set_config(self.get_config().focus_step(distance=distance), ignore_cache=True)
+            results.append(self._capture(folder=folder, keep_on_camera=keep_on_camera, log_exif=False))
+            self.set_config(step, ignore_cache=True)
+        self._log_exif(results)
         return results
 
     def get_config(self, ignore_cache: bool = False) -> "T":
         """
-        Get the current configuration of the camera.
+        Get the current configuration of the camera. Returns a copy, so editing it does not affect later calls.
         :return:
         """
-
-        response = self.get_json_config(ignore_cache=ignore_cache)
-
-        def _get_kwargs(node):
-            if "children" not in node:
-                return node["value"]
-            return {n["name"]: _get_kwargs(n) for n in node["children"]}
-
-        return get_args(self.__orig_class__)[0](**_get_kwargs(response))  # type: ignore
+        self._gp_get_camera_config_cached(ignore_cache=ignore_cache)
+        if self._parsed_config is not None:
+            return self._parsed_config.model_copy(deep=True)
+
+        kwargs: Dict[str, Any] = {}
+        for (*sections, name), value in self._leaf_values.items():
+            target = kwargs
+            for section in sections:
+                target = target.setdefault(section, {})
+            target[name] = value
+
+        # values come straight from the camera, so skip pydantic validation and build the models directly
+        self._parsed_config = _construct(self._config_cls, kwargs)
+        return self._parsed_config.model_copy(deep=True)
+
+    @cached_property
+    def _config_cls(self) -> type[T]:
+        """
+        Resolve the config class this camera was parametrized with, only once per instance.
+        :return:
+        """
+        return get_args(self.__orig_class__)[0]  # type: ignore
 
     @contextmanager
     def config_context(self, new_config: T):
@@ -314,29 +626,40 @@ class Camera(Generic[T]):
         :return:
         """
         updated_settings = set()
-        old_config = self.get_config(ignore_cache=ignore_cache)
         gp_config = self._gp_get_camera_config_cached(ignore_cache=ignore_cache)
 
-        for field in new_config.model_fields_set:
-            if getattr(new_config, field, None) is not None:
-                for field2 in getattr(new_config, field).model_fields_set:
-                    if only_fields is not None and field2 not in only_fields:
-                        logging.debug("Skipping over %s.%s, as not in only_fields", field, field2)
-                        continue
-
-                    new_value = getattr(getattr(new_config, field), field2)
-                    old_value = getattr(getattr(old_config, field), field2)
-                    update = True
-                    if new_value != old_value and new_value is not None:
-                        logging.info(
-                            "Updating %s from %s -> %s",
-                            (field, field2),
-                            old_value,
-                            new_value,
-                        )
-                        updated_settings.add(field2)
-                        _, gp_field = gp.gp_widget_get_child_by_name(gp_config, field2)
-                        gp.check_result(gp.gp_widget_set_value(gp_field, new_value))
+        # plain __dict__ access skips pydantic's attribute descriptors, old values come from the flat leaf table
+        # so only the requested fields are looked at instead of parsing the whole current config
+        def _apply(model: BaseModel, sections: Tuple[str, ...]):
+            for name in model.model_fields_set:
+                new_value = model.__dict__[name]
+                if isinstance(new_value, BaseModel):
+                    # nested (sub-)section, its leaves are stored flat as well
+                    _apply(new_value, sections + (name,))
+                    continue
+                if only_fields is not None and name not in only_fields:
+                    logging.debug("Skipping over %s, as not in only_fields", sections + (name,))
+                    continue
+
+                key = sections + (name,)
+                old_value = self._leaf_values.get(key)
+                if new_value != old_value and new_value is not None:
+                    logging.info(
+                        "Updating %s from %s -> %s",
+                        key,
+                        old_value,
+                        new_value,
+                    )
+                    updated_settings.add(name)
+                    gp_field = self._leaf_widgets.get(key)
+                    if gp_field is None:
+                        raise PyDSLRException(f"Camera does not expose a setting named {'.'.join(key)}")
+                    # the widget tree now differs from the parsed model, drop it even if the camera call below fails
+                    self._parsed_config = None
+                    gp.check_result(gp.gp_widget_set_value(gp_field, new_value))
+                    self._leaf_values[key] = new_value
+
+        _apply(new_config, ())
 
         if updated_settings:
             # this may throw I/O errors, but works
@@ -349,6 +672,21 @@ class Camera(Generic[T]):
     def _gp_get_camera_config_cached(self, ignore_cache: bool = False):
         if self._config is None or ignore_cache:
             self._config = self.camera.get_config()
+            self._leaf_widgets = {}
+            self._leaf_values = {}
+            self._parsed_config = None
+
+            def _index(node, sections):
+                for i in range(node.count_children()):
+                    child = node.get_child(i)
+                    name = child.get_name()
+                    if child.get_type() in (GPWidgetItem.GP_WIDGET_SECTION, GPWidgetItem.GP_WIDGET_WINDOW):
+                        _index(child, sections + (name,))
+                    else:
+                        self._leaf_widgets[sections + (name,)] = child
+                        self._leaf_values[sections + (name,)] = child.get_value()
+
+            _index(self._config, ())
         return self._config
 
     def get_json_config(self, ignore_cache: bool = False):
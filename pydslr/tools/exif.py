@@ -4,6 +4,7 @@ Quick EXIF tools
 
 import logging
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 try:
     import exiftool  # type: ignore
@@ -13,6 +14,14 @@ except (ModuleNotFoundError, FileNotFoundError) as exc:
     logging.warning("ExifTool not found, not reporting any exif information.")
     e_tool = None
 
+_EXIF_KEYS = [
+    "EXIF:ISO",
+    "EXIF:FNumber",
+    "EXIF:ExposureTime",
+    "EXIF:ImageWidth",
+    "EXIF:ImageHeight",
+]
+
 
 def get_exif(path: Path):
     """
@@ -20,14 +29,17 @@ def get_exif(path: Path):
     :param path:
     :return:
     """
-    return_values = [
-        "EXIF:ISO",
-        "EXIF:FNumber",
-        "EXIF:ExposureTime",
-        "EXIF:ImageWidth",
-        "EXIF:ImageHeight",
-    ]
+    return get_exif_batch([path])[0]
+
 
+def get_exif_batch(paths: List[Path]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Return the key EXIF infos for several pictures, using a single exiftool round-trip
+    :param paths:
+    :return:
+    """
+    if not paths:
+        return []
     if e_tool is None:
-        return None
-    return {k: e_tool.get_metadata([path])[0].get(k, None) for k in return_values}
+        return [None] * len(paths)
+    return [{k: metadata.get(k, None) for k in _EXIF_KEYS} for metadata in e_tool.get_metadata(paths)]
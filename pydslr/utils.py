@@ -3,9 +3,9 @@ Helper functions
 """
 
 import enum
+import io
 import logging
-import os
-import string
+import subprocess
 import time
 from functools import wraps
 from pathlib import Path
@@ -53,15 +53,15 @@ class GPWidgetItem(enum.IntEnum):
         Return the data type returned by various widget types
         :return:
         """
-        try:
-            return {
-                self.GP_WIDGET_DATE: int,
-                self.GP_WIDGET_TEXT: str,
-                self.GP_WIDGET_TOGGLE: int,
-                self.GP_WIDGET_RADIO: str,
-            }[self]
-        except KeyError:
-            return None
+        return _VALUE_TYPES.get(self.value)
+
+
+_VALUE_TYPES = {
+    GPWidgetItem.GP_WIDGET_DATE.value: int,
+    GPWidgetItem.GP_WIDGET_TEXT.value: str,
+    GPWidgetItem.GP_WIDGET_TOGGLE.value: int,
+    GPWidgetItem.GP_WIDGET_RADIO.value: str,
+}
 
 
 def generate_pydantic_config(camera: "Camera", file_name: str, class_prefix: str):
@@ -72,14 +72,11 @@ def generate_pydantic_config(camera: "Camera", file_name: str, class_prefix: str
     :param class_prefix:
     :return:
     """
-    config_nodes = [
-        [
-            "# pylint: skip-file",
-            "from typing import Literal, Optional",
-            "from pydantic import BaseModel",
-            "from pydslr.config.base import BaseConfig",
-        ]
-    ]
+    buffer = io.StringIO()
+    buffer.write("# pylint: skip-file\n")
+    buffer.write("from typing import Literal, Optional\n")
+    buffer.write("from pydantic import BaseModel\n")
+    buffer.write("from pydslr.config.base import BaseConfig\n")
     tree = camera.get_json_config()
 
     def _handle(node, depth=0):
@@ -92,7 +89,8 @@ def generate_pydantic_config(camera: "Camera", file_name: str, class_prefix: str
             else:
                 current_node.append(f"class {class_prefix}Config(BaseConfig):")
             for child_node in node["children"]:
-                if child_node["name"][0] in string.digits:
+                first = child_node["name"][:1]
+                if first and "0" <= first <= "9":
                     continue
                 _handle(child_node, depth=depth + 1)
 
@@ -111,18 +109,35 @@ def generate_pydantic_config(camera: "Camera", file_name: str, class_prefix: str
                         type_val = child_node["value_type"].__name__
                     current_node.append(f"\t{child_node['name']}: Optional[{type_val}] = None")
 
+        # children were written by the recursive calls above, so classes are defined before they are referenced
         if current_node:
-            config_nodes.append(current_node)
+            buffer.write("\n".join(current_node))
+            buffer.write("\n")
 
     _handle(tree)
 
+    source = buffer.getvalue()
     target_path = Path(__file__).parent / "config" / file_name
-    with target_path.open("w", encoding="utf-8") as f:
-        for cfg in config_nodes:
-            f.write("\n".join(cfg))
-            f.write("\n")
-
-    os.system(f"black {target_path}")
+    # written unformatted first, so the file exists even if formatting fails
+    target_path.write_text(source, encoding="utf-8")
+    try:
+        # format in-process, avoiding a second interpreter start-up
+        import black  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        try:
+            subprocess.run(["black", "-q", str(target_path)], check=False)
+        except FileNotFoundError:
+            logging.warning("black not found, keeping generated config %s unformatted.", target_path)
+        return
+
+    # same settings as `black .` from the repo root, i.e. [tool.black] in pyproject.toml
+    pyproject = Path(__file__).parent.parent / "pyproject.toml"
+    black_config = black.parse_pyproject_toml(str(pyproject)) if pyproject.exists() else {}
+    mode = black.Mode(line_length=black_config.get("line_length", black.DEFAULT_LINE_LENGTH))
+    try:
+        target_path.write_text(black.format_str(source, mode=mode), encoding="utf-8")
+    except black.InvalidInput:
+        logging.warning("Could not format generated config %s, keeping it unformatted.", target_path)
 
 
 class PyDSLRException(Exception):